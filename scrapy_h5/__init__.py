@@ -19,9 +19,7 @@ Usage:
     def parse(self, response):
         # CSS selectors work directly
         titles = response.css('h1::text').getall()
-
-        # Common XPath patterns are converted to CSS
-        links = response.xpath('//a/@href').getall()
+        links = response.css('a::attr(href)').getall()
 
     # Using LinkExtractor
     from scrapy_h5 import LinkExtractor
@@ -13,7 +13,7 @@ Example:
 """
 
 import logging
-import operator
+import re
 from collections.abc import Callable, Iterable
 from functools import partial
 from typing import Any
@@ -24,15 +24,50 @@ import selectolax.lexbor
 from parsel import Selector
 from scrapy.http import TextResponse
 from scrapy.link import Link
-from scrapy.linkextractors.lxmlhtml import LxmlLinkExtractor, LxmlParserLinkExtractor, _nons, _RegexOrSeveral
-from scrapy.utils.misc import rel_has_nofollow
-from w3lib.html import strip_html5_whitespace
-from w3lib.url import safe_url_string
+from scrapy.linkextractors.lxmlhtml import LxmlLinkExtractor, LxmlParserLinkExtractor, _RegexOrSeveral
+from scrapy.utils.misc import arg_to_iter, rel_has_nofollow
+from w3lib.html import HTML5_WHITESPACE, strip_html5_whitespace
+from w3lib.url import canonicalize_url, safe_url_string
 
 from scrapy_h5.response import HtmlFiveResponse
 
 logger = logging.getLogger(__name__)
 
+_CSS_NAME_RE = re.compile(r"[a-z][a-z0-9_-]*")
+_MISSING = object()
+
+
+def _link_css_selector(
+    tags: tuple[str, ...] | None,
+    attrs: tuple[str, ...] | None,
+    *,
+    any_namespace: bool = False,
+) -> str | None:
+    """Build a CSS selector matching elements with any of the given tags and attributes.
+
+    Args:
+        tags: Tag names to match, or None if tags are filtered by a callable.
+        attrs: Attribute names to match, or None if attributes are filtered by a callable.
+        any_namespace: Whether attributes match by local name in any namespace
+            (``[*|href]`` also matches SVG's ``xlink:href``).
+
+    Returns:
+        A selector like ``a[href],area[href]``, or None if names are unknown,
+        empty or cannot be used verbatim as CSS identifiers.
+    """
+    if not tags or not attrs:
+        return None
+    if not all(_CSS_NAME_RE.fullmatch(name) for name in (*tags, *attrs)):
+        return None
+
+    # One compound selector per tag: an element carrying several of the attributes
+    # must match once, while lexbor reports it once per matching selector in a group
+    ns = "*|" if any_namespace else ""
+    attr_part = (
+        f"[{ns}{attrs[0]}]" if len(attrs) == 1 else ":is({})".format(",".join(f"[{ns}{attr}]" for attr in attrs))
+    )
+    return ",".join(f"{tag}{attr_part}" for tag in tags)
+
 
 class LinkExtractor(LxmlLinkExtractor):
     """A link extractor that uses HTML5 parsers for link extraction.
@@ -56,6 +91,8 @@ class LinkExtractor(LxmlLinkExtractor):
         process_value: Optional callable to process each extracted URL value.
         deny_extensions: File extension(s) to deny. Uses default if None.
         strip: Whether to strip whitespace from URLs. Defaults to True.
+        skip_empty: Whether to skip empty attribute values (e.g. `href=""`, or `href=" "` when
+            `strip` is set), which would otherwise resolve to the page's own URL. Defaults to True.
 
     Example:
         >>> extractor = LinkExtractor(
@@ -79,6 +116,7 @@ class LinkExtractor(LxmlLinkExtractor):
         process_value: Callable[[Any], Any] | None = None,
         deny_extensions: str | Iterable[str] | None = None,
         strip: bool = True,  # noqa: FBT001, FBT002
+        skip_empty: bool = True,  # noqa: FBT001, FBT002
     ) -> None:
         super().__init__(
             allow=allow,
@@ -97,12 +135,13 @@ class LinkExtractor(LxmlLinkExtractor):
             restrict_text=None,
         )
         self.link_extractor = HtmlFiveParserLinkExtractor(
-            tag=partial(operator.contains, tags),
-            attr=partial(operator.contains, attrs),
+            tag=tuple(arg_to_iter(tags)),
+            attr=tuple(arg_to_iter(attrs)),
             unique=unique,
             process=process_value,
             strip=strip,
             canonicalized=not canonicalize,
+            skip_empty=skip_empty,
         )
 
     def extract_links(self, response: TextResponse) -> list[Link]:
@@ -123,10 +162,51 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
     It overrides the `_iter_links` method to traverse the DOM tree and yield
     (element, attribute_name, attribute_value) tuples for matching tags/attrs.
 
+    When tags and attributes are given as names rather than callables, matching
+    elements are preselected with a native CSS query instead of walking every node.
+
     This class is used internally by LinkExtractor and typically should not
     be instantiated directly.
+
+    Args:
+        tag: Tag name(s) to look for, or a callable filtering tag names.
+        attr: Attribute name(s) to look for, or a callable filtering attribute names.
+        process: Optional callable to process each extracted URL value.
+        unique: Whether to deduplicate extracted links.
+        strip: Whether to strip whitespace from URLs.
+        canonicalized: Whether URLs are already canonicalized for deduplication.
+        skip_empty: Whether to skip empty attribute values instead of yielding them. With
+            `strip`, whitespace-only values count as empty.
     """
 
+    def __init__(  # noqa: PLR0913
+        self,
+        tag: str | Iterable[str] | Callable[[str], bool] = "a",
+        attr: str | Iterable[str] | Callable[[str], bool] = "href",
+        *,
+        process: Callable[[Any], Any] | None = None,
+        unique: bool = False,
+        strip: bool = True,
+        canonicalized: bool = False,
+        skip_empty: bool = False,
+    ) -> None:
+        self._tag_names = None if callable(tag) else tuple(dict.fromkeys(arg_to_iter(tag)))
+        self._attr_names = None if callable(attr) else tuple(dict.fromkeys(arg_to_iter(attr)))
+        super().__init__(
+            tag=tag if self._tag_names is None else frozenset(self._tag_names).__contains__,
+            attr=attr if self._attr_names is None else frozenset(self._attr_names).__contains__,
+            process=process,
+            unique=unique,
+            strip=strip,
+            canonicalized=canonicalized,
+        )
+        self.skip_empty = skip_empty
+        self._blank_chars = HTML5_WHITESPACE if strip else ""
+        self._css_selector = _link_css_selector(self._tag_names, self._attr_names)
+        self._css_selector_html5ever = _link_css_selector(self._tag_names, self._attr_names, any_namespace=True)
+        self._process_value = process if callable(process) else None
+        self._url_key = None if canonicalized else partial(canonicalize_url, keep_fragments=True)
+
     def _extract_links(
         self,
         selector: Selector,
@@ -149,15 +229,22 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
             A list of Link objects extracted from the document.
         """
         links: list[Link] = []
+        strip, process_value = self.strip, self._process_value
+        # Duplicates are dropped as they are found, keeping the first occurrence
+        seen: set[str] | None = set() if self.unique else None
+        url_key = self._url_key
+        # Joining with the response URL again is a no-op when it equals the base URL,
+        # unless process_value may have returned a relative URL
+        rejoin = process_value is not None or base_url != response_url
         for el, _attr, attr_val in self._iter_links(selector.root):
             try:
-                if self.strip:
+                if strip:
                     attr_val = strip_html5_whitespace(attr_val)  # noqa: PLW2901
-                attr_val = urljoin(base_url, attr_val)  # noqa: PLW2901
+                url = urljoin(base_url, attr_val)
             except ValueError:
                 continue  # skipping bogus links
-            else:
-                url = self.process_attr(attr_val)
+            if process_value is not None:
+                url = process_value(url)
                 if url is None:
                     continue
             try:
@@ -166,60 +253,20 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
                 continue
 
             # to fix relative links after process_value
-            url = urljoin(response_url, url)
+            if rejoin:
+                url = urljoin(response_url, url)
+            if seen is not None:
+                key = url if url_key is None else url_key(url)
+                if key in seen:
+                    continue
+                seen.add(key)
             link = Link(
                 url,
-                self._get_element_text(el),
-                nofollow=rel_has_nofollow(self._get_element_attr(el, "rel")),
+                el.text(),
+                nofollow=rel_has_nofollow(el.attrs.get("rel")),
             )
             links.append(link)
-        return self._deduplicate_if_needed(links)
-
-    def _get_element_text(
-        self,
-        el: selectolax.lexbor.LexborNode | markupever.dom.BaseNode,
-    ) -> str:
-        """Get the text content of an element.
-
-        Args:
-            el: The element to extract text from.
-
-        Returns:
-            The text content of element, or empty string if none.
-
-        Raises:
-            TypeError if element type is not supported.
-        """
-        if isinstance(el, selectolax.lexbor.LexborNode):
-            return el.text()
-        if isinstance(el, markupever.dom.Element):
-            return el.text()
-
-        raise TypeError(f"Unsupported element type {type(el)}")
-
-    def _get_element_attr(
-        self,
-        el: selectolax.lexbor.LexborNode | markupever.dom.BaseNode,
-        attr: str,
-    ) -> str | None:
-        """Get an attribute value from an element.
-
-        Args:
-            el: The element to get attribute from.
-            attr: The attribute name.
-
-        Returns:
-            The attribute value, or None if not present.
-
-        Raises:
-            TypeError if element type is not supported.
-        """
-        if isinstance(el, selectolax.lexbor.LexborNode):
-            return el.attributes.get(attr)
-        if isinstance(el, markupever.dom.Element):
-            return el.attrs.get(attr)
-
-        raise TypeError(f"Unsupported element type {type(el)}")
+        return links
 
     def _iter_links(
         self,
@@ -233,15 +280,20 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
             document: The root node of the HTML5-parsed document tree.
                 Can be either a selectolax LexborNode or markupever BaseNode.
 
-        Yields:
-            Tuples of (element, attribute_name, attribute_value) for each link found.
+        Returns:
+            The backend iterator over (element, attribute_name, attribute_value) tuples
+            for each link found. It is returned as is rather than re-yielded, so links
+            do not pass through an extra generator frame.
+
+        Raises:
+            TypeError: If the document type is not supported.
         """
         if isinstance(document, selectolax.lexbor.LexborNode):
-            yield from self._iter_links_lexbor(document)
-        elif isinstance(document, markupever.dom.BaseNode):
-            yield from self._iter_links_html5ever(document)
-        else:
-            raise TypeError(f"Unsupported document type {type(document)}")
+            return self._iter_links_lexbor(document)
+        if isinstance(document, markupever.dom.BaseNode):
+            return self._iter_links_html5ever(document)
+
+        raise TypeError(f"Unsupported document type {type(document)}")
 
     def _iter_links_lexbor(
         self,
@@ -250,7 +302,8 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
         """Iterate over links in a selectolax/lexbor document.
 
         Traverses the DOM tree and yields link elements matching the configured
-        tag and attribute filters.
+        tag and attribute filters. Known tag and attribute names are matched by
+        lexbor's CSS engine, so non-link nodes never reach Python.
 
         Args:
             document: The root LexborNode to traverse.
@@ -258,14 +311,28 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
         Yields:
             Tuples of (element, attribute_name, attribute_value) for each link.
         """
-        for el in document.traverse():
-            if not self.scan_tag(_nons(el.tag)):
+        scan_tag, scan_attr = self.scan_tag, self.scan_attr
+        attr_names, skip_empty, blank_chars = self._attr_names, self.skip_empty, self._blank_chars
+        if self._css_selector is not None:
+            elements = document.css(self._css_selector)
+        else:
+            elements = (el for el in document.traverse() if scan_tag(el.tag))
+
+        for el in elements:
+            if attr_names is not None:
+                attribs = el.attrs
+                for attrib in attr_names:
+                    value = attribs.get(attrib, _MISSING)
+                    if value is _MISSING or (skip_empty and not (value and value.strip(blank_chars))):
+                        continue
+                    # lexbor reports valueless attributes (<a href>) as None
+                    yield el, attrib, value or ""
                 continue
-            attribs = el.attributes
-            for attrib in attribs:
-                if not self.scan_attr(attrib):
+
+            for attrib, value in el.attributes.items():
+                if not scan_attr(attrib) or (skip_empty and not (value and value.strip(blank_chars))):
                     continue
-                yield el, attrib, attribs[attrib]
+                yield el, attrib, value or ""
 
     def _iter_links_html5ever(
         self,
@@ -274,7 +341,8 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
         """Iterate over links in a markupever/html5ever document.
 
         Traverses the DOM tree and yields link elements matching the configured
-        tag and attribute filters.
+        tag and attribute filters. Known tag and attribute names are matched by
+        markupever's native CSS engine instead of a Python-level traversal.
 
         Args:
             document: The root BaseNode to traverse.
@@ -282,18 +350,49 @@ class HtmlFiveParserLinkExtractor(LxmlParserLinkExtractor):
         Yields:
             Tuples of (element, attribute_name, attribute_value) for each link.
         """
+        scan_attr, attr_names = self.scan_attr, self._attr_names
+        skip_empty, blank_chars = self.skip_empty, self._blank_chars
+        if self._css_selector_html5ever is not None:
+            elements = document.select(self._css_selector_html5ever)
+        else:
+            elements = self._traverse_html5ever(document)
+
+        for el in elements:
+            attribs = el.attrs
+            if attr_names is not None:
+                for attrib in attr_names:
+                    value = attribs.get(attrib)
+                    if value is None or (skip_empty and not (value and value.strip(blank_chars))):
+                        continue
+                    yield el, attrib, value
+                continue
+
+            for attrib, value in attribs.items():
+                if not scan_attr(attrib.local) or (skip_empty and not (value and value.strip(blank_chars))):
+                    continue
+                yield el, attrib, value
+
+    def _traverse_html5ever(
+        self,
+        document: markupever.dom.BaseNode,
+    ) -> Iterable[markupever.dom.Element]:
+        """Walk a markupever/html5ever document and yield elements passing the tag filter.
+
+        Args:
+            document: The root BaseNode to traverse.
+
+        Yields:
+            Elements whose local name matches the configured tag filter.
+        """
+        scan_tag = self.scan_tag
+        element_cls = markupever.dom.Element
         for edge in document.traverse():
             # Skip closed edges (only process opening traversal)
             if edge.closed:
                 continue
             # EdgeTraverse wraps nodes - get the actual node
             el = edge.node
-            if not isinstance(el, markupever.dom.Element):
-                continue
-            if not self.scan_tag(_nons(el.name.local)):
+            if type(el) is not element_cls:
                 continue
-            attribs = el.attrs
-            for attrib in attribs:
-                if not self.scan_attr(attrib.local):
-                    continue
-                yield el, attrib, attribs[attrib]
+            if scan_tag(el.name.local):
+                yield el
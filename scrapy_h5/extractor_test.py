@@ -1,6 +1,7 @@
 """Tests for LinkExtractor and HtmlFiveParserLinkExtractor."""
 
 import pytest
+from scrapy.linkextractors.lxmlhtml import LxmlParserLinkExtractor
 
 from scrapy_h5 import HtmlFiveResponse, HtmlFiveSelector
 from scrapy_h5.extractor import HtmlFiveParserLinkExtractor, LinkExtractor
@@ -267,6 +268,86 @@ class TestCssLinkExtractor:
         assert "track=" not in urls[0]
         assert "/page" in urls[0]
 
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_extract_links_text_and_nofollow(self, backend: str) -> None:
+        """Test that link text and rel=nofollow are read from the element."""
+        html = b"""
+        <html><body>
+            <a href="/follow"><b>Bold</b> text</a>
+            <a href="/skip" rel="external nofollow">Skip</a>
+        </body></html>
+        """
+        response = self._create_response(backend, html)
+        links = LinkExtractor().extract_links(response)
+
+        assert [(link.url, link.text, link.nofollow) for link in links] == [
+            ("http://example.com/follow", "Bold text", False),
+            ("http://example.com/skip", "Skip", True),
+        ]
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_extract_links_relative_after_process_value(self, backend: str) -> None:
+        """Test that relative URLs returned by process_value are joined with the response URL."""
+        response = self._create_response(backend, b'<html><body><a href="/page">Link</a></body></html>')
+        extractor = LinkExtractor(process_value=lambda url: url.rsplit("/", 1)[-1] + "/next")
+        links = extractor.extract_links(response)
+
+        assert [link.url for link in links] == ["http://example.com/page/next"]
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_extract_links_relative_base_url(self, backend: str) -> None:
+        """Test that links are joined with the response URL when the base URL is relative."""
+        sel = HtmlFiveSelector(backend, text='<a href="page">Link</a>')
+        links = HtmlFiveParserLinkExtractor()._extract_links(sel, "http://example.com/dir/", "utf-8", "")  # noqa: SLF001
+
+        assert [link.url for link in links] == ["http://example.com/dir/page"]
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_extract_links_base_href_scheme_mismatch(self, backend: str) -> None:
+        """Test that links are joined with the response URL when <base href> has another scheme."""
+        html = b"""
+        <html><head><base href="https://example.com/"></head><body>
+            <a href="http:foo">Foo</a>
+            <a href="http:/bar">Bar</a>
+        </body></html>
+        """
+        response = self._create_response(backend, html)
+        links = LinkExtractor().extract_links(response)
+
+        assert [link.url for link in links] == ["http://example.com/foo", "http://example.com/bar"]
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    @pytest.mark.parametrize("canonicalized", [True, False])
+    def test_extract_links_unique_keeps_first(self, backend: str, canonicalized: bool) -> None:  # noqa: FBT001
+        """Test that inline deduplication keeps the first link, as the parent class does."""
+        sel = HtmlFiveSelector(
+            backend,
+            text='<a href="/p?b=2&a=1">First</a><a href="/p?a=1&b=2">Second</a><a href="/p?b=2&a=1">Third</a>',
+        )
+        extractor = HtmlFiveParserLinkExtractor(unique=True, canonicalized=canonicalized)
+        links = extractor._extract_links(sel, "http://example.com/", "utf-8", "http://example.com/")  # noqa: SLF001
+
+        assert links == LxmlParserLinkExtractor._deduplicate_if_needed(extractor, [*links, *links])  # noqa: SLF001
+        assert [link.text for link in links] == (["First", "Second"] if canonicalized else ["First"])
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_extract_links_skip_empty(self, backend: str) -> None:
+        """Test that empty hrefs are skipped by default and resolve to the page URL otherwise."""
+        response = self._create_response(backend, b'<html><body><a href="">Self</a><a href=" ">Blank</a></body></html>')
+
+        assert LinkExtractor().extract_links(response) == []
+        links = LinkExtractor(skip_empty=False).extract_links(response)
+        assert [link.url for link in links] == ["http://example.com"]
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_extract_links_keep_empty_self_link(self, backend: str) -> None:
+        """Test that skip_empty=False keeps Scrapy's behaviour of resolving href="" to the page URL."""
+        response = HtmlFiveResponse(url="http://ex.com/", body=b'<a href="">Self</a>').with_backend(backend)
+
+        links = LinkExtractor(skip_empty=False).extract_links(response)
+        assert [(link.url, link.text) for link in links] == [("http://ex.com/", "Self")]
+        assert LinkExtractor().extract_links(response) == []
+
     @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
     def test_extract_links_multiple_allow_patterns(self, backend: str) -> None:
         """Test multiple allow patterns."""
@@ -452,6 +533,65 @@ class TestHtmlFiveParserLinkExtractor:
         assert "" in values
         assert "/valid" in values
 
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_iter_links_names_match_callables(self, backend: str) -> None:
+        """Test that tag/attr names select the same links as equivalent callables."""
+        html = """
+        <html><body>
+            <area href="/area1">
+            <a href="/link1" rel="nofollow">Link 1</a>
+            <p><a name="anchor">Anchor</a><a href="">Empty</a><a href>Valueless</a></p>
+            <svg><a href="/svg">SVG</a><a xlink:href="/xlink">XLink</a></svg>
+            <img src="/image.png">
+        </body></html>
+        """
+        sel = HtmlFiveSelector(backend, text=html)
+        by_names = HtmlFiveParserLinkExtractor(tag=("a", "area"), attr="href")
+        by_callables = HtmlFiveParserLinkExtractor(
+            tag=lambda t: t in {"a", "area"},
+            attr=lambda a: a == "href",
+        )
+
+        links = [v for _, _, v in by_names._iter_links(sel._root)]  # noqa: SLF001
+        expected = [v for _, _, v in by_callables._iter_links(sel._root)]  # noqa: SLF001
+        assert links == expected
+        # lexbor keeps the qualified attribute name, html5ever matches the local name
+        xlink = [] if backend == "lexbor" else ["/xlink"]
+        assert links == ["/area1", "/link1", "", "", "/svg", *xlink]
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_iter_links_attr_names_order(self, backend: str) -> None:
+        """Test that configured attribute names are yielded in configuration order."""
+        html = '<html><body><a data-link="/data" class="c" href="/href">Multi Attr</a></body></html>'
+        sel = HtmlFiveSelector(backend, text=html)
+        extractor = HtmlFiveParserLinkExtractor(tag="a", attr=("href", "data-link", "src"))
+
+        links = list(extractor._iter_links(sel._root))  # noqa: SLF001
+        assert [(attr, value) for _, attr, value in links] == [("href", "/href"), ("data-link", "/data")]
+
+    def test_css_selector_only_for_plain_names(self) -> None:
+        """Test that CSS preselection is used only for plain tag/attr names."""
+        assert HtmlFiveParserLinkExtractor(tag=("a", "area"), attr="href")._css_selector == "a[href],area[href]"  # noqa: SLF001
+        assert HtmlFiveParserLinkExtractor(tag="a", attr=("href", "src"))._css_selector == "a:is([href],[src])"  # noqa: SLF001
+        assert HtmlFiveParserLinkExtractor(tag="a", attr="xlink:href")._css_selector is None  # noqa: SLF001
+        assert HtmlFiveParserLinkExtractor(tag="a", attr=("href", "src"))._css_selector_html5ever == (  # noqa: SLF001
+            "a:is([*|href],[*|src])"
+        )
+        assert HtmlFiveParserLinkExtractor(tag=lambda t: t == "a")._css_selector is None  # noqa: SLF001
+        assert HtmlFiveParserLinkExtractor(tag=())._css_selector is None  # noqa: SLF001
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    @pytest.mark.parametrize("tag", ["a", lambda t: t == "a"])
+    def test_iter_links_skip_empty(self, backend: str, tag: object) -> None:
+        """Test that empty, valueless and (when stripping) blank attributes are skipped when requested."""
+        html = '<a href="">Empty</a><a href>Valueless</a><a href=" \n">Blank</a><a href="/valid">Valid</a>'
+        sel = HtmlFiveSelector(backend, text=html)
+        stripping = HtmlFiveParserLinkExtractor(tag=tag, skip_empty=True)
+        verbatim = HtmlFiveParserLinkExtractor(tag=tag, skip_empty=True, strip=False)
+
+        assert [v for _, _, v in stripping._iter_links(sel._root)] == ["/valid"]  # noqa: SLF001
+        assert [v for _, _, v in verbatim._iter_links(sel._root)] == [" \n", "/valid"]  # noqa: SLF001
+
 
 class TestCssLinkExtractorInit:
     """Tests for LinkExtractor initialization."""
@@ -484,6 +624,20 @@ class TestCssLinkExtractorInit:
         assert extractor.link_extractor.scan_attr("data-url")
         assert not extractor.link_extractor.scan_attr("href")
 
+    def test_single_tag_string(self) -> None:
+        """Test that a single tag name is matched exactly, not as a substring."""
+        extractor = LinkExtractor(tags="area")
+        assert extractor.link_extractor.scan_tag("area")
+        assert not extractor.link_extractor.scan_tag("a")
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_repeated_names(self, backend: str) -> None:
+        """Test that repeated tag/attr names do not report an element twice."""
+        sel = HtmlFiveSelector(backend, text='<a href="/a">A</a>')
+        extractor = HtmlFiveParserLinkExtractor(tag=["a", "a"], attr=["href", "href"])
+
+        assert [v for _, _, v in extractor._iter_links(sel._root)] == ["/a"]  # noqa: SLF001
+
     def test_link_extractor_type(self) -> None:
         """Test that link_extractor is HtmlFiveParserLinkExtractor."""
         extractor = LinkExtractor()
@@ -2,11 +2,14 @@
 
 from scrapy import Request, Spider, signals
 from scrapy.crawler import Crawler
-from scrapy.http import HtmlResponse, Response, TextResponse
+from scrapy.http import HtmlResponse, JsonResponse, Response, TextResponse, XmlResponse
 from scrapy.responsetypes import responsetypes
 
 from scrapy_h5.response import HtmlFiveResponse
 
+# Response classes already picked by Scrapy from content type, guessing them again would give the same answer
+_NON_HTML_RESPONSE_CLASSES = frozenset({TextResponse, XmlResponse, JsonResponse})
+
 
 class HtmlFiveResponseMiddleware:
     """Downloader Middleware that replaces HtmlResponse with HtmlFiveResponse.
@@ -29,6 +32,11 @@ class HtmlFiveResponseMiddleware:
         SCRAPY_H5_BACKEND = 'html5ever'  # optional, 'lexbor' by default
     """
 
+    # Signals keep weak references to bound receivers, so __weakref__ is required
+    __slots__ = ("__weakref__", "backend")
+
+    response_cls = HtmlFiveResponse
+
     def __init__(self, *, backend: str | None = "lexbor") -> None:
         if backend not in {"lexbor", "html5ever", None}:
             raise ValueError(f"Unsupported html5 backend: {backend}")
@@ -61,13 +69,17 @@ class HtmlFiveResponseMiddleware:
             # Disabled globally or explicitly (for this request)
             return response
 
-        # Only these types of response can be possibly parsed with HTML parser
-        if not isinstance(response, (Response, TextResponse, HtmlResponse)):
+        response_type = type(response)
+        if response_type in _NON_HTML_RESPONSE_CLASSES:
+            # Known non-HTML response, pass through unchanged
             return response
 
-        guess_type = responsetypes.from_args(response.headers, response.url, None, response.body)
-        if isinstance(response, HtmlResponse) or guess_type is HtmlResponse:
-            return response.replace(cls=HtmlFiveResponse).with_backend(scrapy_h5_backend)
+        # Scrapy emits concrete HtmlResponse in most cases, so check exact type first
+        if response_type is not HtmlResponse and not isinstance(response, HtmlResponse):
+            # Other responses can be possibly parsed with HTML parser only if they look like HTML
+            guess_type = responsetypes.from_args(response.headers, response.url, None, response.body)
+            if guess_type is not HtmlResponse:
+                # Not an HTML response, pass through unchanged
+                return response
 
-        # Not an HTML response, pass through unchanged
-        return response
+        return response.replace(cls=self.response_cls).with_backend(scrapy_h5_backend)
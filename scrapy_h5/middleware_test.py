@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 import pytest
 from scrapy import Request, Spider
 from scrapy.http import HtmlResponse, JsonResponse, Response, TextResponse, XmlResponse
+from scrapy.utils.test import get_crawler
 
 from scrapy_h5 import HtmlFiveResponse, HtmlFiveResponseMiddleware, HtmlFiveSelector
 
@@ -125,6 +126,22 @@ class TestHtmlFiveResponseMiddleware:
         assert result.url == response.url
         assert result.body == response.body
 
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_html_response_subclass(self, backend: str) -> None:
+        """Test that HtmlResponse subclasses are converted too."""
+
+        class CustomHtmlResponse(HtmlResponse):
+            pass
+
+        middleware = self._create_middleware(backend=backend)
+        request = self._create_request()
+        response = CustomHtmlResponse(url="http://example.com/data.json", body=b"<html>test</html>")
+
+        result = middleware.process_response(request, response)
+
+        assert isinstance(result, HtmlFiveResponse)
+        assert result.body == response.body
+
     @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
     def test_plain_response_with_html_content_type(self, backend: str) -> None:
         """Test that plain Response with HTML content-type gets converted."""
@@ -143,6 +160,21 @@ class TestHtmlFiveResponseMiddleware:
         assert result.url == response.url
         assert result.body == response.body
 
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_custom_response_cls(self, backend: str) -> None:
+        """Test that response class can be overridden in subclasses."""
+
+        class CustomHtmlFiveResponse(HtmlFiveResponse):
+            pass
+
+        class CustomMiddleware(HtmlFiveResponseMiddleware):
+            response_cls = CustomHtmlFiveResponse
+
+        middleware = CustomMiddleware(backend=backend)
+        result = middleware.process_response(self._create_request(), self._create_html_response())
+
+        assert isinstance(result, CustomHtmlFiveResponse)
+
     def test_from_crawler(self) -> None:
         """Test from_crawler class method."""
         crawler = MagicMock()
@@ -154,6 +186,15 @@ class TestHtmlFiveResponseMiddleware:
         assert middleware.backend == "html5ever"
         crawler.settings.get.assert_called_once_with("SCRAPY_H5_BACKEND", default="lexbor")
 
+    def test_from_crawler_signals(self) -> None:
+        """Test middleware can be connected to real crawler signals."""
+        crawler = get_crawler(settings_dict={"SCRAPY_H5_BACKEND": "html5ever"})
+
+        middleware = HtmlFiveResponseMiddleware.from_crawler(crawler)
+
+        assert middleware.backend == "html5ever"
+        assert not hasattr(middleware, "__dict__")
+
     def test_from_crawler_disabled(self) -> None:
         """Test from_crawler with SCRAPY_H5_BACKEND=False."""
         crawler = MagicMock()
@@ -206,6 +247,51 @@ class TestHtmlFiveResponse:
         selector2 = response.selector
         assert selector1 is selector2
 
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_selector_not_shared_on_replace(self, backend: str) -> None:
+        """Test replace() keeps the backend but parses its own document."""
+        response = HtmlFiveResponse(url="http://example.com", body=self.SAMPLE_HTML).with_backend(backend)
+        selector = response.selector
+
+        replaced = response.replace(flags=["cached"])
+        assert replaced.selector is not selector
+        assert replaced.css("h1::text").get() == "Title"
+
+        # Dropping nodes from one response's document must not affect the other
+        replaced.css("h1").drop()
+        assert replaced.css("h1::text").get() is None
+        assert response.css("h1::text").get() == "Title"
+
+        changed = response.replace(body=b"<h1>Other</h1>")
+        assert changed.selector is not selector
+        assert changed.css("h1::text").get() == "Other"
+
+    def test_selector_reset_on_backend_change(self) -> None:
+        """Test parsed selector is dropped when backend changes."""
+        response = HtmlFiveResponse(url="http://example.com", body=self.SAMPLE_HTML).with_backend("lexbor")
+        selector = response.selector
+
+        replaced = response.replace(cls=HtmlFiveResponse).with_backend("html5ever")
+        assert replaced.selector is not selector
+        assert replaced.css("h1::text").get() == "Title"
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_selector_empty_body(self, backend: str) -> None:
+        """Test selector for response without body."""
+        response = HtmlFiveResponse(url="http://example.com", body=b"").with_backend(backend)
+        assert response.css("h1").getall() == []
+        assert response.css("body").get() is not None
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_selector_non_utf8_body(self, backend: str) -> None:
+        """Test selector decodes body using response encoding."""
+        response = HtmlFiveResponse(
+            url="http://example.com",
+            body="<h1>Заголовок</h1>".encode("cp1251"),
+            encoding="cp1251",
+        ).with_backend(backend)
+        assert response.css("h1::text").get() == "Заголовок"
+
     @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
     def test_css_method(self, backend: str) -> None:
         """Test css() method."""
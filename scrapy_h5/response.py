@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from scrapy.http import HtmlResponse
+from scrapy.http import HtmlResponse, Response
 
 from scrapy_h5.selector import HtmlFiveSelector, HtmlFiveSelectorList
 
@@ -15,21 +15,52 @@ class HtmlFiveResponse(HtmlResponse):
     HTML5 compliance.
     """
 
-    _scrapy_h5_backend = None
-    _cached_h5_selector: HtmlFiveSelector | None = None
+    __slots__ = ("_cached_h5_selector", "_scrapy_h5_backend")
+
+    def __init__(
+        self,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        self._scrapy_h5_backend: str | None = None
+        self._cached_h5_selector: HtmlFiveSelector | None = None
+        super().__init__(*args, **kwargs)
 
     def with_backend(self, backend: str) -> "HtmlFiveResponse":
+        if backend != self._scrapy_h5_backend:
+            self._cached_h5_selector = None
         self._scrapy_h5_backend = backend
         return self
 
+    def replace(
+        self,
+        *args: Any,  # noqa: ANN401
+        cls: type[Response] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Response:
+        """Create a new response, keeping the html5 backend.
+
+        The new response parses its own document: selectors are not shared, because
+        ``drop()`` on one response's selector would otherwise change the other.
+        """
+        response = super().replace(*args, cls=cls, **kwargs)
+        if isinstance(response, HtmlFiveResponse):
+            response._scrapy_h5_backend = self._scrapy_h5_backend  # noqa: SLF001
+        return response
+
     @property
     def selector(self) -> HtmlFiveSelector:
         """Return an HtmlFiveSelector for this response's content.
 
-        The selector is lazily created and cached.
+        The selector is lazily created and cached. Raw body is passed to the parser
+        to avoid building an intermediate unicode copy of the whole document.
         """
         if self._cached_h5_selector is None:
-            self._cached_h5_selector = HtmlFiveSelector(self._scrapy_h5_backend, text=self.text)
+            self._cached_h5_selector = HtmlFiveSelector(
+                self._scrapy_h5_backend,
+                body=self.body,
+                encoding=self.encoding,
+            )
         return self._cached_h5_selector
 
     def xpath(
@@ -37,10 +68,9 @@ class HtmlFiveResponse(HtmlResponse):
         query: str,
         **kwargs: Any,  # noqa: ANN401
     ) -> HtmlFiveSelectorList:
-        """Select elements using XPath (converted to CSS).
+        """Select elements using XPath.
 
-        Note: Only common XPath patterns are supported. Complex expressions
-        will raise XPathConversionError.
+        Note: XPath is not supported by html5 backends, use css() instead.
         """
         return self.selector.xpath(query, **kwargs)
 
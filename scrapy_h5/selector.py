@@ -1,21 +1,121 @@
 """HtmlFiveSelector and HtmlFiveSelectorList classes for HTML parsing."""
 
+import codecs
 import re
+from collections.abc import Callable
+from functools import lru_cache
+from itertools import chain
 from re import Pattern
 from typing import Any, TypeVar, overload
 
 import markupever
 import selectolax.lexbor
-from parsel.utils import extract_regex, flatten, iflatten, shorten
+from parsel.utils import extract_regex, shorten
 from scrapy.utils.trackref import object_ref
+from w3lib.encoding import read_bom
+from w3lib.html import replace_entities as w3lib_replace_entities
 
 _SelectorType = TypeVar("_SelectorType", bound="HtmlFiveSelector")
 _SelectorListType = TypeVar("_SelectorListType", bound="HtmlFiveSelectorList")
 
+# Parser options are immutable, so they are built once and shared by all html5ever parsers
+_HTML5EVER_OPTIONS = markupever.HtmlOptions()
+
+
+@lru_cache(maxsize=512)
+def _parse_css(query: str) -> tuple[tuple[str, bool, str | None], ...]:
+    """Parse CSS query and extract ::text and ::attr() pseudo-elements.
+
+    Handles comma-separated selectors by processing each part. Results are cached,
+    as spiders usually run the same few queries against every response.
+    Returns: tuple of (subquery, is_text, attr_name)
+    """
+    # Handle comma-separated selectors
+    if "," in query:
+        parts: list[tuple[str, bool, str | None]] = []
+        for part in query.split(","):
+            parts.extend(_parse_css(part.strip()))
+        return tuple(parts)
+
+    # Most queries have no pseudo-elements at all
+    if "::" not in query:
+        return ((query, False, None),)
+
+    is_text = False
+    attr_name = None
+
+    # Check for ::text pseudo-element
+    if query.endswith("::text"):
+        query = query[:-6]
+        is_text = True
+    # Check for ::attr(name) pseudo-element
+    elif query.endswith(")"):
+        head, sep, name = query[:-1].rpartition("::attr(")
+        if sep and name and ")" not in name:
+            query, attr_name = head, name
+
+    return ((query, is_text, attr_name),)
+
+
+def _extract_regex_first(
+    regex: str | Pattern[str],
+    text: str,
+    replace_entities: bool = True,  # noqa: FBT001, FBT002
+) -> str | None:
+    """Return the first string parsel's `extract_regex` would produce, or None.
+
+    Stops at the first match instead of collecting all of them.
+    """
+    if isinstance(regex, str):
+        regex = re.compile(regex)
+
+    match = regex.search(text)
+    if match is None:
+        return None
+
+    if "extract" in regex.groupindex:
+        value = match.group("extract")
+        if value is None:
+            return None
+    elif regex.groups:
+        # findall() reports unmatched groups as empty strings
+        value = match.group(1) or ""
+    else:
+        value = match.group(0)
+
+    if not replace_entities:
+        return value
+    return w3lib_replace_entities(value, keep=["lt", "amp"])
+
+
+def _prepare_body(body: bytes, encoding: str) -> tuple[str | None, bytes | None]:
+    """Prepare a response body for parsing.
+
+    A byte order mark wins over the declared encoding and is stripped, as w3lib's
+    html_to_unicode does. Both parsers only decode UTF-8 natively, so other
+    encodings are decoded to text here.
+
+    Args:
+        body: Raw response body.
+        encoding: Declared body encoding.
+
+    Returns:
+        A (text, body) pair with exactly one of them set.
+    """
+    bom_encoding, bom = read_bom(body)
+    if bom is not None:
+        encoding, body = bom_encoding, body[len(bom) :]
+    if codecs.lookup(encoding).name != "utf-8":
+        return body.decode(encoding, errors="replace"), None
+
+    return None, body
+
 
 class HtmlFiveSelectorList(list[_SelectorType], object_ref):
     """A list of HtmlFiveSelector objects with convenience methods for bulk operations."""
 
+    __slots__ = ("__weakref__",)
+
     @overload
     def __getitem__(self, pos: int) -> _SelectorType: ...
 
@@ -37,7 +137,9 @@ class HtmlFiveSelectorList(list[_SelectorType], object_ref):
         **kwargs: Any,  # noqa: ANN401
     ) -> _SelectorListType:
         """Call the `.jmespath()` method for each element in this list."""
-        return self.__class__(flatten([x.jmespath(query, **kwargs) for x in self]))
+        if not self:
+            return self.__class__()
+        return self.__class__(chain.from_iterable(x.jmespath(query, **kwargs) for x in self))
 
     def xpath(
         self,
@@ -45,11 +147,15 @@ class HtmlFiveSelectorList(list[_SelectorType], object_ref):
         **kwargs: Any,  # noqa: ANN401
     ) -> _SelectorListType:
         """Apply XPath query (converted to CSS) to all elements and return flattened results."""
-        return self.__class__(flatten([x.xpath(query, **kwargs) for x in self]))
+        if not self:
+            return self.__class__()
+        return self.__class__(chain.from_iterable(x.xpath(query, **kwargs) for x in self))
 
     def css(self, query: str) -> _SelectorListType:
         """Apply CSS selector to all elements and return flattened results."""
-        return self.__class__(flatten([x.css(query) for x in self]))
+        if not self:
+            return self.__class__()
+        return self.__class__(chain.from_iterable(x.css(query) for x in self))
 
     def re(
         self,
@@ -57,7 +163,12 @@ class HtmlFiveSelectorList(list[_SelectorType], object_ref):
         replace_entities: bool = True,  # noqa: FBT001, FBT002
     ) -> list[str]:
         """Apply regex to all elements and return flattened string results."""
-        return flatten([x.re(regex, replace_entities=replace_entities) for x in self])
+        if not self:
+            return []
+        if isinstance(regex, str):
+            # Compile once for the whole list rather than once per element
+            regex = re.compile(regex)
+        return list(chain.from_iterable(x.re(regex, replace_entities=replace_entities) for x in self))
 
     @overload
     def re_first(
@@ -82,8 +193,13 @@ class HtmlFiveSelectorList(list[_SelectorType], object_ref):
         replace_entities: bool = True,  # noqa: FBT001, FBT002
     ) -> str | None:
         """Apply regex and return first match, or default if no match."""
-        for el in iflatten(x.re(regex, replace_entities=replace_entities) for x in self):
-            return el
+        if isinstance(regex, str):
+            # Compile once for the whole list rather than once per element
+            regex = re.compile(regex)
+        for x in self:
+            value = x.re_first(regex, replace_entities=replace_entities)
+            if value is not None:
+                return value
         return default
 
     def getall(self) -> list[str]:
@@ -125,7 +241,7 @@ class HtmlFiveSelector(object_ref):
     Provides a parsel-compatible API for CSS and XPath selectors.
     """
 
-    __slots__ = ["__weakref__", "_attr", "_backend", "_expr", "_root", "_text"]
+    __slots__ = ["__weakref__", "_attr", "_backend", "_cached_attrib", "_expr", "_root", "_text"]
 
     selectorlist_cls = HtmlFiveSelectorList
 
@@ -139,6 +255,8 @@ class HtmlFiveSelector(object_ref):
         backend: str,
         *,
         text: str | None = None,
+        body: bytes | None = None,
+        encoding: str = "utf-8",
         root: selectolax.lexbor.LexborNode | markupever.dom.BaseNode | None = None,
         _expr: str | None = None,
         _text: bool = False,
@@ -148,24 +266,32 @@ class HtmlFiveSelector(object_ref):
             raise ValueError(f"Unsupported html5 backend: {backend}")
         self._backend = backend
 
-        if text is None and root is None:
-            raise ValueError("At least one of text or root arguments must be provided")
-        if text is not None and root is not None:
-            raise ValueError("At most one of text or root arguments must be provided")
+        provided = sum(arg is not None for arg in (text, body, root))
+        if not provided:
+            raise ValueError("At least one of text, body or root arguments must be provided")
+        if provided > 1:
+            raise ValueError("At most one of text, body or root arguments must be provided")
 
         if text is not None and not isinstance(text, str):
             raise TypeError(f"Argument `text` should be of type str, got {type(text)}")
+        if body is not None and not isinstance(body, bytes):
+            raise TypeError(f"Argument `body` should be of type bytes, got {type(body)}")
+
+        if body is not None:
+            text, body = _prepare_body(body, encoding)
 
         self._expr = _expr
         self._text = _text
         self._attr = _attr
-
-        if text is not None and self._backend == "lexbor":
-            # Parse the HTML text with Lexbor
-            self._root = selectolax.lexbor.LexborHTMLParser(text).root
-        elif text is not None and self._backend == "html5ever":
-            # Parse the HTML text with html5ever
-            self._root = markupever.parse(text).root()
+        self._cached_attrib: dict[str, str | None] | None = None
+
+        content = text if text is not None else body
+        if content is not None and self._backend == "lexbor":
+            # Parse the HTML text (or UTF-8 bytes) with Lexbor
+            self._root = selectolax.lexbor.LexborHTMLParser(content).root
+        elif content is not None and self._backend == "html5ever":
+            # Parse the HTML text (or UTF-8 bytes) with html5ever
+            self._root = markupever.parse(content, _HTML5EVER_OPTIONS).root()
         else:  # root is not None
             self._root = root
 
@@ -191,64 +317,46 @@ class HtmlFiveSelector(object_ref):
         Supports parsel's ::text and ::attr() pseudo-elements.
         """
         results = self.selectorlist_cls()
-        for subquery, is_text, attr_name in self._parse_css(query):
+        for subquery, is_text, attr_name in _parse_css(query):
             results.extend(self._select_css(subquery, is_text, attr_name))
 
         return results
 
-    def _parse_css(self, query: str) -> list[tuple[str, bool, str | None]]:
-        """Parse CSS query and extract ::text and ::attr() pseudo-elements.
-
-        Handles comma-separated selectors by processing each part.
-        Returns: list of (subquery, is_text, attr_name)
-        """
-        # Handle comma-separated selectors
-        if "," in query:
-            parts = []
-            for part in query.split(","):
-                parts.extend(self._parse_css(part.strip()))
-            return parts
-
-        is_text = False
-        attr_name = None
-
-        # Check for ::text pseudo-element
-        if query.endswith("::text"):
-            query = query[:-6]
-            is_text = True
-        # Check for ::attr(name) pseudo-element
-        elif match := re.search(r"::attr\(([^)]+)\)$", query):
-            query = query[: match.start()]
-            attr_name = match.group(1)
-
-        return [(query, is_text, attr_name)]
-
     def _select_css(self, query: str, is_text: bool, attr_name: str | None) -> list[_SelectorType]:  # noqa: FBT001
+        cls = type(self)
+        new = cls.__new__
         if not query.strip():
             # Apply pseudo-element to current element
-            return [
-                self.__class__(
-                    self._backend,
-                    root=self._root,
-                    _expr=query,
-                    _text=is_text,
-                    _attr=attr_name,
-                ),
-            ]
+            return [self._wrap(cls, new, self._root, query, is_text, attr_name)]
 
         elements = (
             self._root.css(query) if isinstance(self._root, selectolax.lexbor.LexborNode) else self._root.select(query)
         )
-        return [
-            self.__class__(
-                self._backend,
-                root=el,
-                _expr=query,
-                _text=is_text,
-                _attr=attr_name,
-            )
-            for el in elements
-        ]
+        return [self._wrap(cls, new, el, query, is_text, attr_name) for el in elements]
+
+    def _wrap(  # noqa: PLR0913, PLR0917
+        self,
+        cls: type[_SelectorType],
+        new: Callable[[type[_SelectorType]], _SelectorType],
+        root: selectolax.lexbor.LexborNode | markupever.dom.BaseNode,
+        expr: str,
+        is_text: bool,  # noqa: FBT001
+        attr_name: str | None,
+    ) -> _SelectorType:
+        """Create a child selector for an already parsed node.
+
+        Bypasses constructor argument validation, which is redundant for nodes
+        selected from this (already validated) selector. The class and its
+        ``__new__`` are resolved once per query by the caller.
+        """
+        selector = new(cls)
+        selector._backend = self._backend  # noqa: SLF001
+        selector._root = root  # noqa: SLF001
+        selector._expr = expr  # noqa: SLF001
+        selector._text = is_text  # noqa: SLF001
+        selector._attr = attr_name  # noqa: SLF001
+        selector._cached_attrib = None  # noqa: SLF001
+        return selector
 
     def re(
         self,
@@ -281,10 +389,8 @@ class HtmlFiveSelector(object_ref):
         replace_entities: bool = True,  # noqa: FBT001, FBT002
     ) -> str | None:
         """Apply regex and return first match."""
-        return next(
-            iflatten(self.re(regex, replace_entities=replace_entities)),
-            default,
-        )
+        value = _extract_regex_first(regex, self.get(), replace_entities=replace_entities)
+        return default if value is None else value
 
     def get(self) -> str:  # noqa: PLR0911
         """Serialize and return the matched node content."""
@@ -328,6 +434,7 @@ class HtmlFiveSelector(object_ref):
         After calling drop(), the element is detached and the parent's
         serialized content will no longer include this element.
         """
+        self._cached_attrib = None
         if isinstance(self._root, selectolax.lexbor.LexborNode):
             self._root.decompose()
         if isinstance(self._root, markupever.dom.BaseNode):
@@ -335,18 +442,36 @@ class HtmlFiveSelector(object_ref):
 
     @property
     def attrib(self) -> dict[str, str | None]:
-        """Return element attributes as a dict."""
+        """Return element attributes as a dict.
+
+        The attributes are read from the backend once per selector, as both backends copy
+        them on every access; each call returns a fresh copy so callers may mutate it.
+        """
+        if self._cached_attrib is not None:
+            return dict(self._cached_attrib)
+
         if isinstance(self._root, selectolax.lexbor.LexborNode):
-            return self._root.attributes
-        if isinstance(self._root, markupever.dom.Element):
+            self._cached_attrib = self._root.attributes
+        elif isinstance(self._root, markupever.dom.Element):
             # Convert AttrsList to dict with proper key extraction
             # markupever uses QualName objects as keys, we need the local name
             attrs = self._root.attrs
-            return {key.local: attrs.get(key, "") for key in attrs}
-        return {}
+            self._cached_attrib = {key.local: attrs.get(key, "") for key in attrs}
+        else:
+            self._cached_attrib = {}
+        return dict(self._cached_attrib)
 
     def __bool__(self) -> bool:
         """Return True if there is content."""
+        if self._text or self._attr:
+            return bool(self.get())
+
+        # Element markup always includes its tags, so there is no need to serialize it
+        if isinstance(self._root, selectolax.lexbor.LexborNode) and self._root.is_element_node:
+            return True
+        if isinstance(self._root, (markupever.dom.Element, markupever.dom.Document)):
+            return True
+
         return bool(self.get())
 
     __nonzero__ = __bool__
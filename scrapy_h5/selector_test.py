@@ -1,14 +1,53 @@
 """Tests for HtmlFiveSelector and HtmlFiveSelectorList."""
 
+import codecs
+import weakref
+
 import pytest
+from parsel.utils import extract_regex
 
 from scrapy_h5 import HtmlFiveSelector, HtmlFiveSelectorList
+from scrapy_h5.selector import _extract_regex_first, _parse_css
+
+
+def test_parse_css_cached() -> None:
+    """Test CSS query parsing splits pseudo-elements and caches the result."""
+    parsed = _parse_css("a::attr(href), h1::text, p")
+    assert parsed == (("a", False, "href"), ("h1", True, None), ("p", False, None))
+    assert _parse_css("a::attr(href), h1::text, p") is parsed
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("a::attr(href)", ("a", False, "href")),
+        ("::attr(href)", ("", False, "href")),
+        ("a[title=')']::attr(href)", ("a[title=')']", False, "href")),
+        ("a::attr()", ("a::attr()", False, None)),
+        ("a:not(.b)", ("a:not(.b)", False, None)),
+    ],
+)
+def test_parse_css_attr(query: str, expected: tuple[str, bool, str | None]) -> None:
+    """Test ::attr() pseudo-element parsing edge cases."""
+    assert _parse_css(query) == (expected,)
+
+
+@pytest.mark.parametrize(
+    "regex",
+    [r"\d+", r"id=(\d+)", r"(a)|(\d+)", r"x(\d)?", r"(?P<extract>\d+)", r"(?P<extract>z)?\d", r"&amp;\w+", r"nomatch"],
+)
+@pytest.mark.parametrize("replace_entities", [True, False])
+def test_extract_regex_first(regex: str, replace_entities: bool) -> None:  # noqa: FBT001
+    """Test first regex match is the same as the first of parsel's extract_regex."""
+    text = "x id=12 &amp;lt; 34 a"
+    expected = extract_regex(regex, text, replace_entities=replace_entities)
+    assert _extract_regex_first(regex, text, replace_entities=replace_entities) == next(iter(expected), None)
 
 
 class TestHtmlFiveSelector:
     """Tests for HtmlFiveSelector class."""
 
-    SAMPLE_HTML = """
+    SAMPLE_HTML = b"""
     <html>
     <head>
         <title>Test Page</title>
@@ -32,79 +71,103 @@ class TestHtmlFiveSelector:
     </html>
     """
 
+    @pytest.fixture(scope="class", params=["lexbor", "html5ever"])
+    @classmethod
+    def sel(cls, request: pytest.FixtureRequest) -> HtmlFiveSelector:
+        """Parse SAMPLE_HTML once per backend and share it between read-only tests."""
+        return HtmlFiveSelector(request.param, body=cls.SAMPLE_HTML)
+
     @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
     def test_create_from_text(self, backend: str) -> None:
         """Test creating selector from HTML text."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
-        assert sel is not None
+        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML.decode())
+        assert sel.css("h1::text").get() == "Hello World"
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_create_from_body(self, backend: str) -> None:
+        """Test creating selector from UTF-8 encoded HTML body."""
+        sel = HtmlFiveSelector(backend, body="<p>héllo — ü</p>".encode())
+        assert sel.css("p::text").get() == "héllo — ü"
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    def test_create_from_body_with_bom(self, backend: str) -> None:
+        """Test UTF-8 byte order mark is not treated as document content."""
+        sel = HtmlFiveSelector(backend, body=b"\xef\xbb\xbf<p>text</p>")
+        assert sel.css("body::text").get() == "text"
+
+    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
+    @pytest.mark.parametrize(
+        ("bom", "bom_encoding"),
+        [(codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be")],
+    )
+    def test_create_from_body_with_utf16_bom(self, backend: str, bom: bytes, bom_encoding: str) -> None:
+        """Test UTF-16 byte order marks are stripped and win over the declared encoding."""
+        body = bom + "<p>тéxt</p>".encode(bom_encoding)
+        for encoding in (bom_encoding, "utf-8"):
+            sel = HtmlFiveSelector(backend, body=body, encoding=encoding)
+            assert "\ufeff" not in sel.css("body").get()
+            assert sel.css("p::text").get() == "тéxt"
 
     @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_xpath(self, backend: str) -> None:
+    def test_create_from_body_non_utf8(self, backend: str) -> None:
+        """Test creating selector from HTML body in non UTF-8 encoding."""
+        sel = HtmlFiveSelector(backend, body="<p>привет</p>".encode("cp1251"), encoding="cp1251")
+        assert sel.css("p::text").get() == "привет"
+
+    def test_create_from_text_and_body(self) -> None:
+        """Test text and body arguments are mutually exclusive."""
+        with pytest.raises(ValueError, match="At most one"):
+            HtmlFiveSelector("lexbor", text="<p></p>", body=b"<p></p>")
+
+    def test_xpath(self, sel: HtmlFiveSelector) -> None:
         """Test xpath() metod."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         try:
             sel.xpath("//li")
             raise AssertionError
         except NotImplementedError:
             pass
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_element(self, backend: str) -> None:
+    def test_css_element(self, sel: HtmlFiveSelector) -> None:
         """Test basic CSS element selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("h1")
         assert len(result) == 1
         assert "Hello World" in result.get()
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_id(self, backend: str) -> None:
+    def test_css_id(self, sel: HtmlFiveSelector) -> None:
         """Test CSS ID selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("#main")
         assert len(result) == 1
         assert "container" in result.get()
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_class(self, backend: str) -> None:
+    def test_css_class(self, sel: HtmlFiveSelector) -> None:
         """Test CSS class selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css(".intro")
         assert len(result) == 1
         assert "introduction" in result.get()
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_descendant(self, backend: str) -> None:
+    def test_css_descendant(self, sel: HtmlFiveSelector) -> None:
         """Test CSS descendant selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("ul a")
         assert len(result) == 3
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_child(self, backend: str) -> None:
+    def test_css_child(self, sel: HtmlFiveSelector) -> None:
         """Test CSS child selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("ul > li")
         assert len(result) == 3
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_attribute(self, backend: str) -> None:
+    def test_css_attribute(self, sel: HtmlFiveSelector) -> None:
         """Test CSS attribute selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a[href]")
         assert len(result) == 3
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_text_pseudo(self, backend: str) -> None:
+    def test_css_text_pseudo(self, sel: HtmlFiveSelector) -> None:
         """Test ::text pseudo-element."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("h1::text")
         assert len(result) == 1
         assert result.get() == "Hello World"
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_attr_pseudo(self, backend: str) -> None:
+    def test_css_attr_pseudo(self, sel: HtmlFiveSelector) -> None:
         """Test ::attr() pseudo-element."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a::attr(href)")
         assert len(result) == 3
         hrefs = result.getall()
@@ -112,62 +175,61 @@ class TestHtmlFiveSelector:
         assert "/link2" in hrefs
         assert "/link3" in hrefs
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_complex(self, backend: str) -> None:
+    def test_css_complex(self, sel: HtmlFiveSelector) -> None:
         """Test CSS attribute selector."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("head > link[rel='canonical']::attr(href)")
         assert len(result) == 1
         assert result[0].get() == "https://www.example.com/preferred-version-of-page"
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_getall(self, backend: str) -> None:
+    def test_getall(self, sel: HtmlFiveSelector) -> None:
         """Test getall() method."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("li a::text").getall()
         assert result == ["Link 1", "Link 2", "Link 3"]
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_get_with_default(self, backend: str) -> None:
+    def test_get_with_default(self, sel: HtmlFiveSelector) -> None:
         """Test get() with default value."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("nonexistent").get(default="not found")
         assert result == "not found"
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_attrib_property(self, backend: str) -> None:
+    def test_attrib_property(self, sel: HtmlFiveSelector) -> None:
         """Test attrib property."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         div = sel.css("#main")
         assert len(div) == 1
         assert div.attrib.get("id") == "main"
         assert "container" in div.attrib.get("class", "")
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_re(self, backend: str) -> None:
+    def test_attrib_cached(self, sel: HtmlFiveSelector) -> None:
+        """Test attributes are read once per selector and returned as a fresh dict."""
+        div = sel.css("#main")[0]
+        assert div.attrib == {"id": "main", "class": "container primary"}
+        assert div._cached_attrib is not None  # noqa: SLF001
+        assert div.attrib is not div.attrib
+
+    def test_attrib_mutation_does_not_leak(self, sel: HtmlFiveSelector) -> None:
+        """Test mutating the returned attrib dict does not change later reads."""
+        div = sel.css("#main")[0]
+        div.attrib.pop("id")
+        div.attrib["class"] = "changed"
+        assert div.attrib == {"id": "main", "class": "container primary"}
+        assert sel.css("#main").attrib == {"id": "main", "class": "container primary"}
+
+    def test_re(self, sel: HtmlFiveSelector) -> None:
         """Test regex extraction."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a::attr(href)").re(r"/link(\d+)")
         assert result == ["1", "2", "3"]
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_re_first(self, backend: str) -> None:
+    def test_re_first(self, sel: HtmlFiveSelector) -> None:
         """Test re_first() method."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a::attr(href)").re_first(r"/link(\d+)")
         assert result == "1"
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_re_first_with_default(self, backend: str) -> None:
+    def test_re_first_with_default(self, sel: HtmlFiveSelector) -> None:
         """Test re_first() with default."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a::attr(href)").re_first(r"notfound", default="default")
         assert result == "default"
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_bool_true(self, backend: str) -> None:
+    def test_bool_true(self, sel: HtmlFiveSelector) -> None:
         """Test boolean conversion with content."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("h1")
         assert bool(result[0]) is True
 
@@ -185,18 +247,22 @@ class TestHtmlFiveSelector:
             assert len(result) == 0
 
     @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_repr(self, backend: str) -> None:
+    def test_bool_attr(self, backend: str) -> None:
+        """Test boolean conversion of attribute selectors."""
+        sel = HtmlFiveSelector(backend, text='<a href="/x" title="">x</a>')
+        assert bool(sel.css("a::attr(href)")[0]) is True
+        assert bool(sel.css("a::attr(title)")[0]) is False
+        assert bool(sel) is True
+
+    def test_repr(self, sel: HtmlFiveSelector) -> None:
         """Test string representation."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("h1")
         repr_str = repr(result[0])
         assert "HtmlFiveSelector" in repr_str
         assert "h1" in repr_str
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_chained_selectors(self, backend: str) -> None:
+    def test_chained_selectors(self, sel: HtmlFiveSelector) -> None:
         """Test chaining CSS selectors."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         # Chain element selectors
         result = sel.css("#main").css("a")
         assert len(result) == 3
@@ -226,7 +292,7 @@ class TestHtmlFiveSelector:
 class TestHtmlFiveSelectorList:
     """Tests for HtmlFiveSelectorList class."""
 
-    SAMPLE_HTML = """
+    SAMPLE_HTML = b"""
     <ul>
         <li><a href="/a">A</a></li>
         <li><a href="/b">B</a></li>
@@ -234,55 +300,61 @@ class TestHtmlFiveSelectorList:
     </ul>
     """
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_getitem_single(self, backend: str) -> None:
+    @pytest.fixture(scope="class", params=["lexbor", "html5ever"])
+    @classmethod
+    def sel(cls, request: pytest.FixtureRequest) -> HtmlFiveSelector:
+        """Parse SAMPLE_HTML once per backend and share it between read-only tests."""
+        return HtmlFiveSelector(request.param, body=cls.SAMPLE_HTML)
+
+    def test_getitem_single(self, sel: HtmlFiveSelector) -> None:
         """Test indexing single element."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("li")
         assert isinstance(result[0], HtmlFiveSelector)
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_getitem_slice(self, backend: str) -> None:
+    def test_getitem_slice(self, sel: HtmlFiveSelector) -> None:
         """Test slicing."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("li")
         sliced = result[1:]
         assert isinstance(sliced, HtmlFiveSelectorList)
         assert len(sliced) == 2
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_css_on_list(self, backend: str) -> None:
+    def test_css_on_list(self, sel: HtmlFiveSelector) -> None:
         """Test CSS on SelectorList."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("li").css("a::text")
         assert result.getall() == ["A", "B", "C"]
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_attrib_on_list(self, backend: str) -> None:
+    def test_bulk_ops_on_empty_list(self, sel: HtmlFiveSelector) -> None:
+        """Test bulk operations on empty SelectorList."""
+        empty = sel.css("nonexistent")
+        result = empty.css("a")
+        assert isinstance(result, HtmlFiveSelectorList)
+        assert len(result) == 0
+        assert empty.re(r"\w+") == []
+        assert empty.re_first(r"\w+") is None
+
+    def test_weakref_to_list(self, sel: HtmlFiveSelector) -> None:
+        """Test that selector lists support weak references, like parsel's SelectorList."""
+        result = sel.css("a")
+        assert weakref.ref(result)() is result
+
+    def test_attrib_on_list(self, sel: HtmlFiveSelector) -> None:
         """Test attrib property on list."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a")
         # Returns first element's attrib
         assert result.attrib.get("href") == "/a"
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_attrib_on_empty_list(self, backend: str) -> None:
+    def test_attrib_on_empty_list(self, sel: HtmlFiveSelector) -> None:
         """Test attrib on empty list."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("nonexistent")
         assert result.attrib == {}
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_extract_alias(self, backend: str) -> None:
+    def test_extract_alias(self, sel: HtmlFiveSelector) -> None:
         """Test extract() is alias for getall()."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a::text")
         assert result.extract() == result.getall()
 
-    @pytest.mark.parametrize("backend", ["lexbor", "html5ever"])
-    def test_extract_first_alias(self, backend: str) -> None:
+    def test_extract_first_alias(self, sel: HtmlFiveSelector) -> None:
         """Test extract_first() is alias for get()."""
-        sel = HtmlFiveSelector(backend, text=self.SAMPLE_HTML)
         result = sel.css("a::text")
         assert result.extract_first() == result.get()
 